@@ -7,102 +7,536 @@ Analyzes file content and generates meaningful names.
 from __future__ import annotations
 
 import argparse
-import base64
+import atexit
+import functools
+import hashlib
 import json
+import mmap
+import os
 import re
+import shutil
+import sqlite3
+import sys
 import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
 
-import fitz  # PyMuPDF
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    from pybase64 import b64encode  # SIMD-accelerated, optional
+except ImportError:
+    from binascii import b2a_base64
 
-def encode_image_to_base64(image_path: Path) -> str:
-    """Encode an image file to base64 string."""
-    return base64.b64encode(image_path.read_bytes()).decode("utf-8")
+    def b64encode(data: bytes) -> bytes:
+        # The C routine behind base64.b64encode, without its Python-level wrapper
+        return b2a_base64(data, newline=False)
+
+try:
+    # Faster, and works on bytes directly; optional
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: object) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """How document pages are turned into model input."""
+    dpi: int = 150
+    # Vision models downscale larger inputs anyway, so cap the long side; None disables
+    max_image_px: int | None = 1536
+    colorspace: str = "rgb"  # "rgb" or "gray"
+    image_format: str = "jpeg"  # "jpeg" or "png"
+    jpeg_quality: int = 85
+    annotations: bool = True  # also draws form field values, so on unless asked
+    cache_dir: Path | None = None  # where rendered pages are kept between runs
+    # Send a PDF's own text instead of an image when its first page has at least this
+    # many words; None always renders
+    pdf_text_min_words: int | None = 30
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache directory, following XDG_CACHE_HOME when set."""
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "smartname"
+
+
+def _stat_key(file_path: Path) -> tuple[int, int]:
+    """Modification time and size of a file; a change to its content changes them."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def memoize_by_file(maxsize: int) -> Callable[[Callable], Callable]:
+    """
+    Memoize a function whose first argument is a file path. The path's mtime and
+    size are part of the cache key, so a modified file is processed again.
+    """
+    def decorate(func: Callable) -> Callable:
+        @functools.lru_cache(maxsize=maxsize)
+        def cached(file_path, stat_key, *args):
+            return func(file_path, *args)
+        
+        @functools.wraps(func)
+        def wrapper(file_path, *args):
+            return cached(file_path, _stat_key(file_path), *args)
+        
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    
+    return decorate
+
+
+@memoize_by_file(maxsize=1024)
+def file_digest(file_path: Path) -> str:
+    """Content hash of a file, used to key on-disk caches."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Bump when prompts change so answers cached by earlier versions are not reused
+PROMPT_VERSION = 1
+
+
+class ResultCache:
+    """
+    Raw model answers from earlier runs, stored in SQLite and keyed by file content,
+    model and PROMPT_VERSION. Names are stored before casing, so changing --case
+    still hits. Safe to share between threads.
+    """
+    
+    def __init__(self, path: Path, model: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.model = model
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, answer TEXT NOT NULL)"
+        )
+    
+    def _key(self, file_path: Path, kind: str) -> str:
+        return f"{file_digest(file_path)}:{self.model}:{PROMPT_VERSION}:{kind}"
+    
+    def get(self, file_path: Path, kind: str) -> str | None:
+        """
+        Return the cached answer of type `kind` for this file, or None.
+        An unreadable file or a failed lookup counts as a miss, so the file is left
+        to the per-file error handling instead of stopping the run.
+        """
+        try:
+            key = self._key(file_path, kind)
+            with self._lock:
+                row = self._conn.execute("SELECT answer FROM results WHERE key = ?", (key,)).fetchone()
+        except (OSError, sqlite3.Error):
+            return None
+        return row[0] if row else None
+    
+    def put(self, file_path: Path, kind: str, answer: str) -> None:
+        try:
+            key = self._key(file_path, kind)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, answer) VALUES (?, ?)", (key, answer)
+                )
+        except (OSError, sqlite3.Error) as e:
+            log(f"  Could not cache result: {e}")
+
+
+def category_kind(categories: list[str]) -> str:
+    """ResultCache kind for category answers; answers for another category list are not reused."""
+    return f"category:{', '.join(categories)}"
+
+
+# Shared keep-alive session so each Ollama request reuses an open connection
+# (Ollama only speaks HTTP/1.1 on its plain-HTTP port, so there is no HTTP/2 to gain)
+_SESSION = requests.Session()
+_SESSION.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip"})
+
+
+def configure_http_session(pool_size: int = 32) -> None:
+    """
+    Size the keep-alive connection pool to the number of concurrent Ollama requests.
+    `pool_connections` is the number of hosts kept, `pool_maxsize` the connections per host.
+    Only failures to connect are retried, since the request has not reached Ollama yet;
+    anything later is left to the per-file error handling.
+    """
+    retries = Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_size, max_retries=retries)
+    _SESSION.mount("http://", adapter)
+    _SESSION.mount("https://", adapter)
+
+
+# Pool for callers using the call_ollama_* helpers directly; resized per run
+configure_http_session()
+
+
+# Per-thread buffer of progress lines, see buffered_output()
+_output = threading.local()
+_print_lock = threading.Lock()
+
+
+def log(message: str = "") -> None:
+    """Print a progress line, or buffer it while inside buffered_output()."""
+    lines = getattr(_output, "lines", None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+
+@contextmanager
+def buffered_output() -> Iterator[None]:
+    """
+    Collect this thread's log() lines and print them as one block on exit,
+    so files analyzed in parallel don't interleave their output.
+    """
+    if getattr(_output, "lines", None) is not None:
+        yield  # already buffering further up the stack
+        return
+    _output.lines = []
+    try:
+        yield
+    finally:
+        lines, _output.lines = _output.lines, None
+        if lines:
+            with _print_lock:
+                print("\n".join(lines), flush=True)
+
+
+def default_concurrency() -> int:
+    """
+    Number of files to analyze at once.
+    Follows OLLAMA_NUM_PARALLEL when set so requests line up with the server's slots.
+    """
+    try:
+        return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", "")))
+    except ValueError:
+        return 4
+
+
+def default_render_workers() -> int:
+    """Number of processes used to render PDF pages (PyMuPDF holds the GIL while rendering)."""
+    return min(os.cpu_count() or 1, 6)
+
+
+# Encodings kept by each thread while inside reused_encodings()
+_encodings = threading.local()
+
+
+@contextmanager
+def reused_encodings() -> Iterator[None]:
+    """
+    Encode each image file once within this block, on this thread, so a batch
+    that is retried file by file does not encode its images twice.
+    The encodings are dropped on exit rather than held for the rest of the run.
+    """
+    if getattr(_encodings, "memo", None) is not None:
+        yield  # already reusing further up the stack
+        return
+    _encodings.memo = {}
+    try:
+        yield
+    finally:
+        _encodings.memo = None
+
+
+def encode_image_to_base64(image_path: Path) -> bytes:
+    """Encode an image file to base64, as ASCII bytes ready to be placed in a request."""
+    memo = getattr(_encodings, "memo", None)
+    if memo is None:
+        return _encode_file_to_base64(image_path)
+    key = (image_path, _stat_key(image_path))
+    if key not in memo:
+        memo[key] = _encode_file_to_base64(image_path)
+    return memo[key]
+
+
+def _encode_file_to_base64(image_path: Path) -> bytes:
+    with open(image_path, "rb", buffering=0) as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""  # an empty file cannot be mapped
+        # Map the file rather than reading it, so its bytes are never copied into the heap
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return b64encode(mapped)
+
+
+def encode_bytes_to_base64(data: bytes) -> bytes:
+    """Encode in-memory image bytes to base64, as ASCII bytes."""
+    return b64encode(data)
 
 
 def call_ollama_vision(
     model: str,
     prompt: str,
-    images: Iterable[Path],
+    images: Iterable[Path | bytes],
     ollama_url: str = "http://127.0.0.1:11434",
+    json_format: bool = False,
 ) -> str:
-    """Call Ollama vision model with images and a prompt."""
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "images": [encode_image_to_base64(path) for path in images],
-        "stream": False,
-    }
-
-    response = requests.post(f"{ollama_url}/api/generate", json=payload, timeout=600)
-    response.raise_for_status()
-    data = response.json()
-    return str(data.get("response", "")).strip()
+    """
+    Call Ollama vision model with images (file paths or encoded bytes) and a prompt.
+    With `json_format`, Ollama constrains the response to valid JSON.
+    """
+    fields = {"prompt": prompt}
+    if json_format:
+        fields["format"] = "json"
+    encoded = [
+        encode_bytes_to_base64(image) if isinstance(image, bytes) else encode_image_to_base64(image)
+        for image in images
+    ]
+    return post_generate(model, fields, ollama_url, images=encoded)
 
 
 def call_ollama_text(
     model: str,
     prompt: str,
     ollama_url: str = "http://127.0.0.1:11434",
+    json_format: bool = False,
 ) -> str:
-    """Call Ollama model for text-only analysis."""
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-    }
-
-    response = requests.post(f"{ollama_url}/api/generate", json=payload, timeout=600)
+    """
+    Call Ollama model for text-only analysis.
+    With `json_format`, Ollama constrains the response to valid JSON.
+    """
+    fields = {"prompt": prompt}
+    if json_format:
+        fields["format"] = "json"
+    return post_generate(model, fields, ollama_url)
+
+
+@functools.lru_cache(maxsize=None)
+def generate_payload_prefix(model: str) -> bytes:
+    """Serialized opening of a generate request; the same for every call to a model."""
+    return json_dumps({"model": model, "stream": True})[:-1] + b","
+
+
+def post_generate(
+    model: str,
+    fields: dict,
+    ollama_url: str,
+    images: list[bytes] | None = None,
+) -> str:
+    """
+    Send a request to Ollama's generate endpoint and return the response text.
+    `fields` holds the per-request parts of the payload (prompt, format) and
+    `images` the base64-encoded images, if any.
+    The response is streamed and read incrementally as newline-delimited JSON chunks.
+    """
+    # Serialize once to bytes ourselves; requests' json= would build an extra str copy
+    # of every base64 image on the way. Only the per-request fields are serialized;
+    # the constant model/stream prefix is reused.
+    parts = [generate_payload_prefix(model), json_dumps(fields)[1:-1]]
+    if images:
+        # Base64 needs no JSON escaping, so the encoded images are spliced in as they
+        # are instead of going through the serializer; the join below is their only copy
+        parts.append(b',"images":[')
+        for index, image in enumerate(images):
+            parts += [b',"' if index else b'"', image, b'"']
+        parts.append(b"]")
+    parts.append(b"}")
+    body = b"".join(parts)
+    response = _SESSION.post(
+        f"{ollama_url}/api/generate",
+        data=body,
+        headers={"Content-Type": "application/json"},
+        # Fail fast when Ollama isn't running; generation itself may be slow
+        timeout=(10, 600),
+        stream=True,
+    )
     response.raise_for_status()
-    data = response.json()
-    return str(data.get("response", "")).strip()
+    
+    parts = []
+    with response:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json_loads(line)
+            if "error" in chunk:
+                raise RuntimeError(f"Ollama error: {chunk['error']}")
+            parts.append(chunk.get("response", ""))
+            if chunk.get("done"):
+                break
+    return "".join(parts).strip()
+
+
+def rasterize_pdf_first_page(pdf_path: Path, render: RenderOptions = RenderOptions()) -> bytes:
+    """Render first page of PDF as encoded image bytes, without touching the disk."""
+    # Imported on first use: PyMuPDF is slow to load and many runs have no documents
+    import fitz
+    
+    # The context manager closes the document even if rendering fails
+    with fitz.open(pdf_path) as doc:
+        page = doc.load_page(0)
+        
+        zoom = render.dpi / 72.0
+        if render.max_image_px:
+            zoom = min(zoom, render.max_image_px / max(page.rect.width, page.rect.height))
+        matrix = fitz.Matrix(zoom, zoom)
+        # Grayscale is a third of the RGB data and is enough for text-heavy pages
+        colorspace = fitz.csGRAY if render.colorspace == "gray" else fitz.csRGB
+        pix = page.get_pixmap(
+            matrix=matrix, colorspace=colorspace, alpha=False, annots=render.annotations
+        )
+        # JPEG is several times smaller than lossless PNG for scanned and photographic pages
+        if render.image_format == "jpeg":
+            image_bytes = pix.tobytes("jpeg", jpg_quality=render.jpeg_quality)
+        else:
+            image_bytes = pix.tobytes("png")
+        # Drop the raw samples (tens of MB at high DPI) before the encoded copy is passed on
+        del pix, page
+    
+    return image_bytes
 
 
-def extract_pdf_first_page(pdf_path: Path, dpi: int = 150) -> Path:
-    """Extract first page of PDF as an image."""
-    doc = fitz.open(pdf_path)
-    page = doc.load_page(0)
+@memoize_by_file(maxsize=64)
+def render_pdf_first_page(pdf_path: Path, render: RenderOptions = RenderOptions()) -> bytes | Path:
+    """
+    Render first page of PDF as an image.
+    With `render.cache_dir` set, pages rendered by an earlier run are returned as
+    the cached file instead of being rasterized again. Recent renders are also kept
+    in memory, so organizing and renaming the same document renders it once.
+    """
+    if render.cache_dir is None:
+        return rasterize_pdf_first_page(pdf_path, render)
     
-    zoom = dpi / 72.0
-    matrix = fitz.Matrix(zoom, zoom)
-    pix = page.get_pixmap(matrix=matrix)
+    # Key on content and every setting that changes the output, so edits and new flags miss
+    variant = f"{render.dpi}-max{render.max_image_px or 0}-{render.colorspace}{'' if render.annotations else '-noannots'}"
+    if render.image_format == "jpeg":
+        variant += f"-q{render.jpeg_quality}.jpg"
+    else:
+        variant += ".png"
+    cached = render.cache_dir / "pages" / f"{file_digest(pdf_path)}-p1-{variant}"
+    if cached.exists():
+        return cached
     
-    temp_dir = Path(tempfile.gettempdir()) / "smartname"
-    temp_dir.mkdir(exist_ok=True)
-    image_path = temp_dir / f"{pdf_path.stem}_page1.png"
-    pix.save(image_path)
+    image_bytes = rasterize_pdf_first_page(pdf_path, render)
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent runs never see a partial file
+        partial = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        partial.write_bytes(image_bytes)
+        os.replace(partial, cached)
+    except OSError as e:
+        log(f"  Could not cache rendered page: {e}")
+    return image_bytes
+
+
+def extract_pdf_text(pdf_path: Path, max_chars: int = 2000) -> str:
+    """Extract the text layer of the first page of a PDF (empty for scanned pages)."""
+    import fitz  # PyMuPDF, imported on first use
     
-    doc.close()
-    return image_path
+    with fitz.open(pdf_path) as doc:
+        content = doc.load_page(0).get_text("text").strip()
+    if len(content) > max_chars:
+        return content[:max_chars] + "..."
+    return content
+
+
+def load_pdf_first_page(pdf_path: Path, render: RenderOptions = RenderOptions()) -> str | bytes | Path:
+    """
+    Prepare the first page of a PDF for the model.
+    Digitally created PDFs already contain their text, so that is returned as a str
+    and no rendering or vision call is needed; otherwise the page is rendered.
+    """
+    if render.pdf_text_min_words is not None:
+        content = extract_pdf_text(pdf_path)
+        if len(content.split()) >= render.pdf_text_min_words:
+            return content
+    return render_pdf_first_page(pdf_path, render)
 
 
-def extract_video_frame(video_path: Path) -> Path | None:
-    """Extract a frame from video using ffmpeg if available."""
+@contextmanager
+def pdf_page_renders(
+    files: list[Path],
+    render: RenderOptions = RenderOptions(),
+    workers: int = 1,
+) -> Iterator[dict[Path, Future[tuple[str | bytes | Path, list[str]]]]]:
+    """
+    Start preparing the first page of every PDF in `files` in a pool of processes.
+    Yields pending pages keyed by path, so analysis can begin while later pages render.
+    """
+    pdfs = [f for f in files if f.suffix.lower() == ".pdf"]
+    if workers <= 1 or len(pdfs) < 2:
+        yield {}
+        return
+    
+    # Each worker opens its own Document; fitz objects are not safe to share across processes
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(pdfs)))
+    try:
+        yield {pdf: executor.submit(_load_pdf_first_page_logged, pdf, render) for pdf in pdfs}
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _load_pdf_first_page_logged(
+    pdf_path: Path,
+    render: RenderOptions,
+) -> tuple[str | bytes | Path, list[str]]:
+    # Runs in a render worker, where nothing buffers output; its log() lines are
+    # returned so the analyzing thread can log them within the file's own block
+    _output.lines = []
+    try:
+        return load_pdf_first_page(pdf_path, render), _output.lines
+    finally:
+        _output.lines = None
+
+
+def rendered_page(
+    pdf_pages: dict[Path, Future[tuple[str | bytes | Path, list[str]]]],
+    file_path: Path,
+) -> str | bytes | Path | None:
+    """Wait for a file's background render, if one was started."""
+    future = pdf_pages.get(file_path)
+    if future is None:
+        return None
+    page, lines = future.result()
+    for line in lines:
+        log(line)
+    return page
+
+
+def extract_video_frame(video_path: Path) -> bytes | None:
+    """
+    Extract a frame from video as JPEG bytes using ffmpeg if available.
+    Recent frames are memoized, so a file that is asked about twice runs ffmpeg once.
+    """
+    try:
+        return _extract_video_frame(video_path)
+    except OSError:
+        return None
+
+
+@memoize_by_file(maxsize=16)
+def _extract_video_frame(video_path: Path) -> bytes | None:
     try:
         import subprocess
         
-        temp_dir = Path(tempfile.gettempdir()) / "smartname"
-        temp_dir.mkdir(exist_ok=True)
-        image_path = temp_dir / f"{video_path.stem}_frame.jpg"
-        
-        # Extract frame at 1 second
+        # Extract frame at 1 second. -ss before -i seeks the input instead of decoding
+        # up to that point, and the JPEG is piped back rather than written to disk.
         result = subprocess.run(
             [
-                "ffmpeg", "-i", str(video_path),
+                "ffmpeg", "-loglevel", "error",
                 "-ss", "00:00:01",
+                "-i", str(video_path),
                 "-vframes", "1",
-                "-y",
-                str(image_path)
+                "-f", "image2pipe", "-vcodec", "mjpeg",
+                "pipe:1",
             ],
             capture_output=True,
-            text=True
         )
         
-        if result.returncode == 0 and image_path.exists():
-            return image_path
+        if result.returncode == 0 and result.stdout:
+            return result.stdout
     except (ImportError, FileNotFoundError):
         pass
     
@@ -112,7 +546,10 @@ def extract_video_frame(video_path: Path) -> Path | None:
 def read_text_snippet(file_path: Path, max_chars: int = 2000) -> str:
     """Read the beginning of a text file."""
     try:
-        content = file_path.read_text(encoding="utf-8")
+        # Text-mode reads are counted in characters and decode only what they need,
+        # so a huge file costs no more than a small one; one extra shows if there is more
+        with open(file_path, encoding="utf-8") as f:
+            content = f.read(max_chars + 1)
         if len(content) > max_chars:
             return content[:max_chars] + "..."
         return content
@@ -161,75 +598,161 @@ def extract_pptx_content(pptx_path: Path, max_chars: int = 2000) -> str:
         return ""
 
 
-def docx_to_images(docx_path: Path, dpi: int = 150) -> list[Path]:
+# Scratch space for intermediate files, resolved once
+_TEMP_DIR = Path(tempfile.gettempdir()) / "smartname"
+
+# LibreOffice runs one instance per user profile, so conversions are serialized.
+# Converted files are remembered for the rest of the run (None if conversion failed).
+_office_lock = threading.Lock()
+_office_pdfs: dict[Path, Path | None] = {}
+
+
+def convert_office_to_pdf(paths: Iterable[Path], timeout: int = 30) -> None:
     """
-    Convert first page of DOCX to image using LibreOffice if available.
-    Falls back to text extraction.
+    Convert office documents to PDF, several per LibreOffice process, so its
+    startup is paid once rather than per file. Files converted earlier are skipped;
+    results are looked up with office_pdf().
     """
-    try:
-        import subprocess
+    import subprocess
+    
+    with _office_lock:
+        pending = [path for path in dict.fromkeys(paths) if path not in _office_pdfs]
         
-        temp_dir = Path(tempfile.gettempdir()) / "smartname"
-        temp_dir.mkdir(exist_ok=True)
+        # Output is named after the input's stem, so same-stem files go to separate runs
+        groups: list[dict[str, Path]] = []
+        for path in pending:
+            group = next((group for group in groups if path.stem not in group), None)
+            if group is None:
+                group = {}
+                groups.append(group)
+            group[path.stem] = path
         
-        # Convert to PDF first using LibreOffice
-        pdf_path = temp_dir / f"{docx_path.stem}.pdf"
-        result = subprocess.run(
-            [
-                "soffice", "--headless", "--convert-to", "pdf",
-                "--outdir", str(temp_dir), str(docx_path)
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0 and pdf_path.exists():
-            # Convert PDF to image
-            image_path = extract_pdf_first_page(pdf_path, dpi)
-            return [image_path]
-    except (ImportError, FileNotFoundError, subprocess.TimeoutExpired):
-        pass
-    
-    return []
+        if groups:
+            _TEMP_DIR.mkdir(exist_ok=True)
+        for group in groups:
+            outdir = Path(tempfile.mkdtemp(prefix="office-", dir=_TEMP_DIR))
+            atexit.register(shutil.rmtree, outdir, True)
+            try:
+                subprocess.run(
+                    [
+                        "soffice", "--headless", "--convert-to", "pdf",
+                        "--outdir", str(outdir), *map(str, group.values()),
+                    ],
+                    capture_output=True,
+                    timeout=timeout * len(group),
+                )
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                pass
+            for stem, path in group.items():
+                pdf_path = outdir / f"{stem}.pdf"
+                _office_pdfs[path] = pdf_path if pdf_path.exists() else None
 
 
-def pptx_to_images(pptx_path: Path, dpi: int = 150) -> list[Path]:
+def office_pdf(path: Path) -> Path | None:
+    """PDF version of an office document, converting it if that has not happened yet."""
+    convert_office_to_pdf([path])
+    return _office_pdfs[path]
+
+
+def office_to_images(path: Path, render: RenderOptions = RenderOptions()) -> list[bytes | Path]:
     """
-    Convert first slide of PPTX to image using LibreOffice if available.
-    Falls back to text extraction.
+    Convert the first page of a DOCX or first slide of a PPTX to an image using
+    LibreOffice if available. Returns an empty list otherwise, so callers can
+    fall back to text extraction.
     """
-    try:
-        import subprocess
-        
-        temp_dir = Path(tempfile.gettempdir()) / "smartname"
-        temp_dir.mkdir(exist_ok=True)
-        
-        # Convert to PDF first using LibreOffice
-        pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
-        result = subprocess.run(
-            [
-                "soffice", "--headless", "--convert-to", "pdf",
-                "--outdir", str(temp_dir), str(pptx_path)
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0 and pdf_path.exists():
-            # Convert PDF to image
-            image_path = extract_pdf_first_page(pdf_path, dpi)
-            return [image_path]
-    except (ImportError, FileNotFoundError, subprocess.TimeoutExpired):
-        pass
+    # Convert to PDF first using LibreOffice
+    pdf_path = office_pdf(path)
+    if pdf_path is None:
+        return []
+    # Convert PDF to image. LibreOffice stamps every export with a new creation date,
+    # so the converted PDF's digest never repeats and its page is not cached on disk.
+    return [render_pdf_first_page(pdf_path, replace(render, cache_dir=None))]
+
+
+# Compiled once; these run on every model answer
+_SPACE_RUNS = re.compile(r'[\s_]+')
+# File extensions that the model might have added to a suggestion
+_SUGGESTED_EXTENSION = re.compile(
+    r'\.(txt|pdf|png|jpg|jpeg|mov|mp4|ipynb|py|js|json|md|docx|pptx)$', re.IGNORECASE
+)
+# Numbering in line-per-file answers, such as "1. code" or "File 2: books"
+_LINE_NUMBERING = re.compile(r"^\W*(?:file\s*)?\d+\s*[.):\-]\s*", re.IGNORECASE)
+# Fields of a combined answer, for when its JSON is malformed
+_ANSWER_FIELDS = re.compile(r'"(category|filename)"\s*:\s*"([^"]*)"')
+# Characters that are invalid in filenames on common filesystems, for str.translate
+_INVALID_FILENAME_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+# Word separators besides whitespace, turned into spaces so str.split() sees them
+_WORD_SEPARATORS = str.maketrans('_-', '  ')
+
+
+def _words(text: str) -> list[str]:
+    """Split a name into words on whitespace, underscores and hyphens."""
+    return text.translate(_WORD_SEPARATORS).split()
+
+
+# Anything that keeps lowercase text from already being in a style: other
+# separators, doubled separators, or separators at either end
+_NOT_SNAKE = re.compile(r'[\s-]|__|^_|_\Z')
+_NOT_KEBAB = re.compile(r'[\s_]|--|^-|-\Z')
+_NOT_LOWER = re.compile(r'[^\S ]|[_-]|  |^ | \Z')
+
+
+def _in_style(text: str, not_in_style: re.Pattern[str]) -> bool:
+    # Lets text that is already converted skip tokenizing and joining
+    return text.lower() == text and not not_in_style.search(text)
+
+
+def _join_tokens(words: list[str], sep: str, first: Callable[[str], str], rest: Callable[[str], str]) -> str:
+    """Join words with sep, passing the first word through first() and the others through rest()."""
+    if not words:
+        return ""
+    if first is rest is str.lower:
+        # Lowercasing the joined name is one C pass instead of one call per word
+        return sep.join(words).lower()
+    # join() materializes its input anyway; a list skips the generator overhead
+    return sep.join([first(words[0]), *[rest(w) for w in words[1:]]])
+
+
+# How each --case style joins words: separator, case of the first word, case of
+# the rest, and what keeps text from already being in the style (None if any text
+# must be converted)
+_CASE_RULES = {
+    "snake": ("_", str.lower, str.lower, _NOT_SNAKE),
+    "kebab": ("-", str.lower, str.lower, _NOT_KEBAB),
+    "camel": ("", str.lower, str.capitalize, None),
+    "pascal": ("", str.capitalize, str.capitalize, None),
+    "lower": (" ", str.lower, str.lower, _NOT_LOWER),
+    "title": (" ", str.capitalize, str.capitalize, None),
+}
+
+
+def _case_handler(sep: str, first: Callable[[str], str], rest: Callable[[str], str],
+                  not_in_style: re.Pattern[str] | None) -> Callable[[str], str]:
+    # One cache per style, so a run that mixes styles does not evict one with another
+    @functools.lru_cache(maxsize=2048)
+    def handler(text: str) -> str:
+        if not_in_style is not None and _in_style(text, not_in_style):
+            return text
+        return _join_tokens(_words(text), sep, first, rest)
     
-    return []
+    return handler
+
+
+# Converts a name to each --case style
+_CASE_HANDLERS = {style: _case_handler(*rule) for style, rule in _CASE_RULES.items()}
+# Keeps the name as suggested, apart from what sanitizing already strips or replaces
+_CASE_HANDLERS["none"] = str
+CASE_STYLES = tuple(_CASE_HANDLERS)
+
+# Where a long name in each style may be cut
+_CASE_SEPARATORS = {"snake": "_", "kebab": "-", "lower": "_", "title": "_"}
 
 
 def apply_casing(text: str, case_style: str) -> str:
     """
     Apply a casing style to text.
+    Each converting style memoizes its own results (see `_CASE_HANDLERS[style].cache_info()`),
+    since models often suggest the same names again; `none` returns the text as is.
     
     Styles:
     - snake: snake_case (default)
@@ -238,26 +761,17 @@ def apply_casing(text: str, case_style: str) -> str:
     - pascal: PascalCase
     - lower: lowercase with spaces
     - title: Title Case With Spaces
+    - none: unchanged
     """
-    # First normalize to words
-    words = re.sub(r'[_\-\s]+', ' ', text).strip().split()
-    
-    if case_style == "snake":
-        return "_".join(w.lower() for w in words)
-    elif case_style == "kebab":
-        return "-".join(w.lower() for w in words)
-    elif case_style == "camel":
-        if not words:
-            return ""
-        return words[0].lower() + "".join(w.capitalize() for w in words[1:])
-    elif case_style == "pascal":
-        return "".join(w.capitalize() for w in words)
-    elif case_style == "lower":
-        return " ".join(w.lower() for w in words)
-    elif case_style == "title":
-        return " ".join(w.capitalize() for w in words)
-    else:
-        return "_".join(w.lower() for w in words)  # default to snake_case
+    # Unknown styles default to snake_case
+    return _CASE_HANDLERS.get(case_style, _CASE_HANDLERS["snake"])(text)
+
+
+def apply_casing_many(texts: list[str], case_style: str) -> list[str]:
+    """Apply a casing style to several texts, converting each distinct text once."""
+    handler = _CASE_HANDLERS.get(case_style, _CASE_HANDLERS["snake"])
+    converted = {text: handler(text) for text in set(texts)}
+    return [converted[text] for text in texts]
 
 
 def sanitize_filename(name: str, max_length: int = 100, case_style: str = "snake") -> str:
@@ -265,20 +779,29 @@ def sanitize_filename(name: str, max_length: int = 100, case_style: str = "snake
     Clean up a suggested filename to be filesystem-safe.
     Remove/replace invalid characters and limit length.
     """
+    name = apply_casing(_strip_invalid(name), case_style)
+    return _limit_length(name, max_length, case_style)
+
+
+def sanitize_filenames(names: list[str], max_length: int = 100, case_style: str = "snake") -> list[str]:
+    """sanitize_filename() for several names, casing each distinct name once."""
+    cased = apply_casing_many([_strip_invalid(name) for name in names], case_style)
+    return [_limit_length(name, max_length, case_style) for name in cased]
+
+
+def _strip_invalid(name: str) -> str:
     # Remove or replace invalid characters
-    name = re.sub(r'[<>:"/\\|?*]', '', name)
+    name = name.translate(_INVALID_FILENAME_CHARS)
     # Replace multiple spaces/underscores with single ones
-    name = re.sub(r'[\s_]+', '_', name)
+    name = _SPACE_RUNS.sub('_', name)
     # Remove leading/trailing spaces and underscores
-    name = name.strip(' _.')
-    
-    # Apply casing style
-    name = apply_casing(name, case_style)
-    
-    # Limit length
+    return name.strip(' _.')
+
+
+def _limit_length(name: str, max_length: int, case_style: str) -> str:
     if len(name) > max_length:
         # Try to cut at word boundary
-        separator = "_" if case_style in ["snake", "lower", "title"] else "-" if case_style == "kebab" else ""
+        separator = _CASE_SEPARATORS.get(case_style, "")
         if separator and separator in name:
             name = name[:max_length].rsplit(separator, 1)[0]
         else:
@@ -287,6 +810,10 @@ def sanitize_filename(name: str, max_length: int = 100, case_style: str = "snake
     return name if name else "unnamed"
 
 
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}
+OFFICE_EXTENSIONS = {".docx", ".pptx"}
+TEXT_EXTENSIONS = {".txt", ".md", ".ipynb", ".py", ".js", ".json"}
+
 # Default categories for file organization
 DEFAULT_CATEGORIES = [
     "books",
@@ -306,11 +833,15 @@ def categorize_file(
     model: str,
     ollama_url: str,
     categories: list[str] | None = None,
-    dpi: int = 150,
+    render: RenderOptions = RenderOptions(),
+    pdf_page: str | bytes | Path | None = None,
+    results: ResultCache | None = None,
 ) -> str:
     """
     Analyze a file and categorize it into one of the predefined categories.
     Returns the category name.
+    `pdf_page` is an already prepared first page for PDFs; prepared on demand if omitted.
+    Answers are looked up in and added to `results` when given.
     """
     if categories is None:
         categories = DEFAULT_CATEGORIES
@@ -318,10 +849,16 @@ def categorize_file(
     file_ext = file_path.suffix.lower()
     category_list = ", ".join(categories)
     
-    print(f"\nCategorizing: {file_path.name}")
+    log(f"\nCategorizing: {file_path.name}")
+    
+    if results is not None:
+        cached = results.get(file_path, category_kind(categories))
+        if cached is not None:
+            log("  Using cached answer")
+            return match_category(cached, categories)
     
     # Handle images
-    if file_ext in {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}:
+    if file_ext in IMAGE_EXTENSIONS:
         prompt = (
             f"Analyze this image and categorize it into ONE of these categories: {category_list}.\n"
             "Consider the content and purpose of the image.\n"
@@ -341,24 +878,34 @@ def categorize_file(
     
     # Handle PDFs
     elif file_ext == ".pdf":
-        temp_image = extract_pdf_first_page(file_path, dpi)
-        prompt = (
-            f"Analyze this PDF document and categorize it into ONE of these categories: {category_list}.\n"
-            "Consider the content and purpose of the document.\n"
-            "Examples:\n"
-            "- 'books': textbooks, ebooks, book chapters\n"
-            "- 'documents': forms, letters, reports, official documents\n"
-            "- 'presentations': presentation slides, slide decks\n"
-            "- 'figures': research papers with figures, scientific documents\n"
-            "- 'other': anything that doesn't fit the above categories\n\n"
-            "Respond with ONLY the category name, nothing else."
-        )
-        category = call_ollama_vision(model, prompt, [temp_image], ollama_url)
+        if pdf_page is None:
+            pdf_page = load_pdf_first_page(file_path, render)
+        if isinstance(pdf_page, str):
+            # Text-native PDF: no need to look at the page
+            prompt = (
+                f"This is the text of the first page of a PDF document:\n\n{pdf_page}\n\n"
+                f"Categorize it into ONE of these categories: {category_list}.\n"
+                "Respond with ONLY the category name, nothing else."
+            )
+            category = call_ollama_text(model, prompt, ollama_url)
+        else:
+            prompt = (
+                f"Analyze this PDF document and categorize it into ONE of these categories: {category_list}.\n"
+                "Consider the content and purpose of the document.\n"
+                "Examples:\n"
+                "- 'books': textbooks, ebooks, book chapters\n"
+                "- 'documents': forms, letters, reports, official documents\n"
+                "- 'presentations': presentation slides, slide decks\n"
+                "- 'figures': research papers with figures, scientific documents\n"
+                "- 'other': anything that doesn't fit the above categories\n\n"
+                "Respond with ONLY the category name, nothing else."
+            )
+            category = call_ollama_vision(model, prompt, [pdf_page], ollama_url)
     
     # Handle DOCX files
     elif file_ext == ".docx":
         # Try visual conversion first
-        images = docx_to_images(file_path, dpi)
+        images = office_to_images(file_path, render)
         if images:
             prompt = (
                 f"Analyze this Word document and categorize it into ONE of these categories: {category_list}.\n"
@@ -370,7 +917,7 @@ def categorize_file(
             # Fall back to text extraction
             content = extract_docx_content(file_path)
             if not content:
-                print("  Could not extract DOCX content, defaulting to 'documents'")
+                log("  Could not extract DOCX content, defaulting to 'documents'")
                 return "documents"
             
             prompt = (
@@ -383,7 +930,7 @@ def categorize_file(
     # Handle PPTX files
     elif file_ext == ".pptx":
         # Try visual conversion first
-        images = pptx_to_images(file_path, dpi)
+        images = office_to_images(file_path, render)
         if images:
             prompt = (
                 f"Analyze this PowerPoint presentation and categorize it into ONE of these categories: {category_list}.\n"
@@ -394,7 +941,7 @@ def categorize_file(
             # Fall back to text extraction
             content = extract_pptx_content(file_path)
             if not content:
-                print("  Could not extract PPTX content, defaulting to 'presentations'")
+                log("  Could not extract PPTX content, defaulting to 'presentations'")
                 return "presentations"
             
             prompt = (
@@ -406,22 +953,22 @@ def categorize_file(
     
     # Handle videos
     elif file_ext in {".mov", ".mp4", ".avi", ".mkv", ".webm"}:
-        frame_path = extract_video_frame(file_path)
-        if frame_path:
+        frame = extract_video_frame(file_path)
+        if frame:
             prompt = (
                 f"Analyze this video frame and categorize the video into ONE of these categories: {category_list}.\n"
                 "Respond with ONLY the category name, nothing else."
             )
-            category = call_ollama_vision(model, prompt, [frame_path], ollama_url)
+            category = call_ollama_vision(model, prompt, [frame], ollama_url)
         else:
-            print("  Could not extract video frame, defaulting to 'other'")
+            log("  Could not extract video frame, defaulting to 'other'")
             return "other"
     
     # Handle text files and notebooks
-    elif file_ext in {".txt", ".md", ".ipynb", ".py", ".js", ".json"}:
+    elif file_ext in TEXT_EXTENSIONS:
         content = read_text_snippet(file_path)
         if not content:
-            print("  Could not read file content, defaulting to 'code'")
+            log("  Could not read file content, defaulting to 'code'")
             return "code"
         
         prompt = (
@@ -432,45 +979,154 @@ def categorize_file(
         category = call_ollama_text(model, prompt, ollama_url)
     
     else:
-        print(f"  Unsupported file type: {file_ext}, defaulting to 'other'")
+        log(f"  Unsupported file type: {file_ext}, defaulting to 'other'")
         return "other"
     
-    # Clean up the response
-    category = category.strip().strip('"\'`.,!?;:').lower()
+    if results is not None and usable_category(category, categories):
+        results.put(file_path, category_kind(categories), category)
+    return match_category(category, categories)
+
+
+def match_category(response: str, categories: list[str]) -> str:
+    """Map a raw model response onto one of `categories`, defaulting to 'other'."""
+    category = _clean_category(response)
     
     # Validate category - try exact match first
     if category in categories:
-        print(f"  Category: {category}")
+        log(f"  Category: {category}")
         return category
     
     # Try to find partial match (e.g., "art." -> "art")
     for valid_cat in categories:
-        if category.startswith(valid_cat) or valid_cat in category:
-            print(f"  Category: {valid_cat} (matched from '{category}')")
+        if valid_cat in category:
+            log(f"  Category: {valid_cat} (matched from '{category}')")
             return valid_cat
     
     # Default to 'other' if no match found
-    print(f"  VLM returned invalid category '{category}', defaulting to 'other'")
+    log(f"  VLM returned invalid category '{category}', defaulting to 'other'")
     return "other"
 
 
+def usable_category(response: str, categories: list[str]) -> bool:
+    """Whether match_category() finds one of `categories` in a raw response instead of defaulting."""
+    category = _clean_category(response)
+    return any(valid_cat in category for valid_cat in categories)
+
+
+def _clean_category(response: str) -> str:
+    return response.strip().strip('"\'`.,!?;:').lower()
+
+
+def categorize_files_batch(
+    file_paths: list[Path],
+    model: str,
+    ollama_url: str,
+    categories: list[str] | None = None,
+    results: ResultCache | None = None,
+) -> list[str]:
+    """
+    Categorize several text files with a single Ollama request.
+    Returns categories in the same order as `file_paths`; files with an answer
+    in `results` are left out of the request, and files with no readable content
+    default to 'code' like in categorize_file().
+    Raises ValueError if the model does not return one category per file.
+    """
+    if categories is None:
+        categories = DEFAULT_CATEGORIES
+    kind = category_kind(categories)
+    
+    names = ", ".join(path.name for path in file_paths)
+    log(f"\nCategorizing batch: {names}")
+    
+    answers = {}
+    if results is not None:
+        for path in file_paths:
+            cached = results.get(path, kind)
+            if cached is not None:
+                answers[path] = cached
+    # An empty or unreadable file is not sent, so it cannot fail the whole batch
+    snippets = {path: read_text_snippet(path) for path in file_paths if path not in answers}
+    pending = [path for path, content in snippets.items() if content]
+    if pending:
+        contents = [snippets[path] for path in pending]
+        answers.update(zip(pending, request_categories(pending, contents, model, ollama_url, categories)))
+        if results is not None:
+            for path in pending:
+                if usable_category(answers[path], categories):
+                    results.put(path, kind, answers[path])
+    
+    categorized = []
+    for path in file_paths:
+        log(f"  {path.name}:")
+        if path not in answers:
+            log("  Could not read file content, defaulting to 'code'")
+            categorized.append("code")
+            continue
+        categorized.append(match_category(answers[path], categories))
+    return categorized
+
+
+def request_categories(
+    file_paths: list[Path],
+    contents: list[str],
+    model: str,
+    ollama_url: str,
+    categories: list[str],
+) -> list[str]:
+    """Ask for the categories of several text files, given their snippets, at once; returns the raw answers."""
+    sections = [
+        f"File {number} ({path.suffix.lower()}):\n{content}"
+        for number, (path, content) in enumerate(zip(file_paths, contents), 1)
+    ]
+    
+    prompt = (
+        f"These are the contents of {len(file_paths)} files:\n\n"
+        + "\n\n".join(sections)
+        + f"\n\nCategorize each file into ONE of these categories: {', '.join(categories)}.\n"
+        f"Respond with exactly {len(file_paths)} lines, one category per line, "
+        "in the same order as the files, nothing else."
+    )
+    response = call_ollama_text(model, prompt, ollama_url)
+    
+    # Tolerate numbering such as "1. code" or "File 2: books"
+    lines = [
+        _LINE_NUMBERING.sub("", line.strip())
+        for line in response.splitlines()
+        if line.strip()
+    ]
+    if len(lines) != len(file_paths):
+        raise ValueError(f"expected {len(file_paths)} categories, got {len(lines)}")
+    return lines
+
+
 def generate_filename_for_file(
     file_path: Path,
     model: str,
     ollama_url: str,
-    dpi: int = 150,
+    render: RenderOptions = RenderOptions(),
     case_style: str = "snake",
+    pdf_page: str | bytes | Path | None = None,
+    results: ResultCache | None = None,
 ) -> str:
     """
     Analyze a file and generate a descriptive filename.
     Returns the suggested name without extension.
+    `pdf_page` is an already prepared first page for PDFs; prepared on demand if omitted.
+    Answers are looked up in and added to `results` when given.
     """
     file_ext = file_path.suffix.lower()
     
-    print(f"\nAnalyzing: {file_path.name}")
+    log(f"\nAnalyzing: {file_path.name}")
+    
+    if results is not None:
+        cached = results.get(file_path, "name")
+        if cached is not None:
+            suggested = clean_suggestion(cached, case_style)
+            log(f"  Suggested: {suggested}{file_ext} (cached)")
+            return suggested
     
     # Handle images
-    if file_ext in {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}:
+    if file_ext in IMAGE_EXTENSIONS:
         prompt = (
             "Analyze this image and suggest a concise, descriptive filename "
             "(5-8 words max, use underscores instead of spaces). "
@@ -481,20 +1137,33 @@ def generate_filename_for_file(
     
     # Handle PDFs
     elif file_ext == ".pdf":
-        temp_image = extract_pdf_first_page(file_path, dpi)
-        prompt = (
-            "This is the first page of a PDF document. "
-            "Analyze it and suggest a concise, descriptive filename "
-            "(5-8 words max, use underscores instead of spaces). "
-            "Focus on the document's topic or title. "
-            "Only respond with the filename, nothing else."
-        )
-        suggested = call_ollama_vision(model, prompt, [temp_image], ollama_url)
+        if pdf_page is None:
+            pdf_page = load_pdf_first_page(file_path, render)
+        if isinstance(pdf_page, str):
+            # Text-native PDF: no need to look at the page
+            prompt = (
+                f"This is the text of the first page of a PDF document:\n\n"
+                f"{pdf_page}\n\n"
+                "Suggest a concise, descriptive filename based on the content "
+                "(5-8 words max, use underscores instead of spaces). "
+                "Focus on the document's topic or title. "
+                "Only respond with the filename, nothing else."
+            )
+            suggested = call_ollama_text(model, prompt, ollama_url)
+        else:
+            prompt = (
+                "This is the first page of a PDF document. "
+                "Analyze it and suggest a concise, descriptive filename "
+                "(5-8 words max, use underscores instead of spaces). "
+                "Focus on the document's topic or title. "
+                "Only respond with the filename, nothing else."
+            )
+            suggested = call_ollama_vision(model, prompt, [pdf_page], ollama_url)
     
     # Handle DOCX files
     elif file_ext == ".docx":
         # Try visual conversion first
-        images = docx_to_images(file_path, dpi)
+        images = office_to_images(file_path, render)
         if images:
             prompt = (
                 "This is the first page of a Word document. "
@@ -508,7 +1177,7 @@ def generate_filename_for_file(
             # Fall back to text extraction
             content = extract_docx_content(file_path)
             if not content:
-                print("  Could not extract DOCX content")
+                log("  Could not extract DOCX content")
                 return file_path.stem
             
             prompt = (
@@ -523,7 +1192,7 @@ def generate_filename_for_file(
     # Handle PPTX files
     elif file_ext == ".pptx":
         # Try visual conversion first
-        images = pptx_to_images(file_path, dpi)
+        images = office_to_images(file_path, render)
         if images:
             prompt = (
                 "This is the first slide of a PowerPoint presentation. "
@@ -537,7 +1206,7 @@ def generate_filename_for_file(
             # Fall back to text extraction
             content = extract_pptx_content(file_path)
             if not content:
-                print("  Could not extract PPTX content")
+                log("  Could not extract PPTX content")
                 return file_path.stem
             
             prompt = (
@@ -551,24 +1220,24 @@ def generate_filename_for_file(
     
     # Handle videos
     elif file_ext in {".mov", ".mp4", ".avi", ".mkv", ".webm"}:
-        frame_path = extract_video_frame(file_path)
-        if frame_path:
+        frame = extract_video_frame(file_path)
+        if frame:
             prompt = (
                 "This is a frame from a video. "
                 "Analyze it and suggest a concise, descriptive filename for the video "
                 "(5-8 words max, use underscores instead of spaces). "
                 "Only respond with the filename, nothing else."
             )
-            suggested = call_ollama_vision(model, prompt, [frame_path], ollama_url)
+            suggested = call_ollama_vision(model, prompt, [frame], ollama_url)
         else:
-            print("  Could not extract video frame (ffmpeg not available)")
+            log("  Could not extract video frame (ffmpeg not available)")
             return file_path.stem
     
     # Handle text files and notebooks
-    elif file_ext in {".txt", ".md", ".ipynb", ".py", ".js", ".json"}:
+    elif file_ext in TEXT_EXTENSIONS:
         content = read_text_snippet(file_path)
         if not content:
-            print("  Could not read file content")
+            log("  Could not read file content")
             return file_path.stem
         
         prompt = (
@@ -581,17 +1250,269 @@ def generate_filename_for_file(
         suggested = call_ollama_text(model, prompt, ollama_url)
     
     else:
-        print(f"  Unsupported file type: {file_ext}")
+        log(f"  Unsupported file type: {file_ext}")
         return file_path.stem
     
-    # Clean up the suggestion
+    if results is not None and usable_name(suggested):
+        results.put(file_path, "name", suggested)
+    suggested = clean_suggestion(suggested, case_style)
+    log(f"  Suggested: {suggested}{file_ext}")
+    return suggested
+
+
+def clean_suggestion(suggested: str, case_style: str = "snake") -> str:
+    """Turn a raw model suggestion into a sanitized filename stem."""
+    return sanitize_filename(_strip_suggestion(suggested), case_style=case_style)
+
+
+def clean_suggestions(suggested: list[str], case_style: str = "snake") -> list[str]:
+    """clean_suggestion() for several suggestions at once."""
+    return sanitize_filenames([_strip_suggestion(s) for s in suggested], case_style=case_style)
+
+
+def usable_name(suggested: str) -> bool:
+    """Whether a raw model suggestion leaves a name in any case style, rather than 'unnamed'."""
+    return bool(_words(_strip_invalid(_strip_suggestion(suggested))))
+
+
+def _strip_suggestion(suggested: str) -> str:
     suggested = suggested.strip().strip('"\'`')
     # Remove any file extensions that the model might have added
-    suggested = re.sub(r'\.(txt|pdf|png|jpg|jpeg|mov|mp4|ipynb|py|js|json|md|docx|pptx)$', '', suggested, flags=re.IGNORECASE)
-    suggested = sanitize_filename(suggested, case_style=case_style)
+    return _SUGGESTED_EXTENSION.sub('', suggested)
+
+
+def describe_file(
+    file_path: Path,
+    render: RenderOptions = RenderOptions(),
+    pdf_page: str | bytes | Path | None = None,
+) -> tuple[str, list[Path | bytes]] | None:
+    """
+    Prepare a file for a single model request that does not depend on the question asked.
+    Returns an introduction for the prompt and the images to send with it (empty for
+    text), or None if nothing could be extracted.
+    """
+    file_ext = file_path.suffix.lower()
     
-    print(f"  Suggested: {suggested}{file_ext}")
-    return suggested
+    if file_ext in IMAGE_EXTENSIONS:
+        return "Analyze this image.", [file_path]
+    
+    if file_ext == ".pdf":
+        if pdf_page is None:
+            pdf_page = load_pdf_first_page(file_path, render)
+        if isinstance(pdf_page, str):
+            return f"This is the text of the first page of a PDF document:\n\n{pdf_page}\n\n", []
+        return "This is the first page of a PDF document.", [pdf_page]
+    
+    if file_ext == ".docx":
+        images = office_to_images(file_path, render)
+        if images:
+            return "This is the first page of a Word document.", images
+        content = extract_docx_content(file_path)
+        if content:
+            return f"This is the content of a Word document:\n\n{content}\n\n", []
+        return None
+    
+    if file_ext == ".pptx":
+        images = office_to_images(file_path, render)
+        if images:
+            return "This is the first slide of a PowerPoint presentation.", images
+        content = extract_pptx_content(file_path)
+        if content:
+            return f"This is the content of a PowerPoint presentation:\n\n{content}\n\n", []
+        return None
+    
+    if file_ext in {".mov", ".mp4", ".avi", ".mkv", ".webm"}:
+        frame = extract_video_frame(file_path)
+        if frame:
+            return "This is a frame from a video.", [frame]
+        return None
+    
+    if file_ext in TEXT_EXTENSIONS:
+        content = read_text_snippet(file_path)
+        if content:
+            return f"This is the content of a {file_ext} file:\n\n{content}\n\n", []
+        return None
+    
+    return None
+
+
+def categorize_and_name(
+    file_path: Path,
+    model: str,
+    ollama_url: str,
+    categories: list[str] | None = None,
+    render: RenderOptions = RenderOptions(),
+    case_style: str = "snake",
+    pdf_page: str | bytes | Path | None = None,
+    results: ResultCache | None = None,
+) -> tuple[str, str]:
+    """
+    Categorize a file and suggest a name for it with a single Ollama request.
+    Returns the category and the suggested name without extension.
+    Raises ValueError if the file has no usable content or the response lacks either part.
+    """
+    if categories is None:
+        categories = DEFAULT_CATEGORIES
+    kind = category_kind(categories)
+    file_ext = file_path.suffix.lower()
+    
+    log(f"\nAnalyzing: {file_path.name}")
+    
+    category = filename = None
+    if results is not None:
+        category = results.get(file_path, kind)
+        filename = results.get(file_path, "name")
+    if category is not None and filename is not None:
+        log("  Using cached answers")
+    else:
+        source = describe_file(file_path, render, pdf_page)
+        if source is None:
+            raise ValueError("no content to analyze")
+        intro, images = source
+        
+        prompt = (
+            f"{intro}\n"
+            f"Categorize it into ONE of these categories: {', '.join(categories)}, "
+            "and suggest a concise, descriptive filename "
+            "(5-8 words max, use underscores instead of spaces) based on its main subject or topic.\n"
+            'Respond with JSON of the form {"category": "...", "filename": "..."}.'
+        )
+        if images:
+            response = call_ollama_vision(model, prompt, images, ollama_url, json_format=True)
+        else:
+            response = call_ollama_text(model, prompt, ollama_url, json_format=True)
+        
+        try:
+            answer = json_loads(response)
+            category, filename = str(answer["category"]), str(answer["filename"])
+        except (ValueError, KeyError, TypeError):
+            # Models occasionally wrap or truncate the JSON; pick the fields out directly
+            fields = dict(_ANSWER_FIELDS.findall(response))
+            if "category" not in fields or "filename" not in fields:
+                raise ValueError(f"unparseable response: {response!r}")
+            category, filename = fields["category"], fields["filename"]
+        
+        # Unusable answers are not stored, so the next run asks again
+        if results is not None:
+            if usable_category(category, categories):
+                results.put(file_path, kind, category)
+            if usable_name(filename):
+                results.put(file_path, "name", filename)
+    
+    category = match_category(category, categories)
+    suggested = clean_suggestion(filename, case_style)
+    log(f"  Suggested: {suggested}{file_ext}")
+    return category, suggested
+
+
+def generate_filenames_for_images(
+    image_paths: list[Path],
+    model: str,
+    ollama_url: str,
+    case_style: str = "snake",
+    results: ResultCache | None = None,
+) -> list[str]:
+    """
+    Name several image files with a single Ollama request.
+    Returns suggested names in the same order as `image_paths`; images with an
+    answer in `results` are left out of the request.
+    Raises ValueError if the model does not return one name per image.
+    """
+    names = ", ".join(path.name for path in image_paths)
+    log(f"\nAnalyzing batch: {names}")
+    
+    answers = {}
+    if results is not None:
+        for path in image_paths:
+            cached = results.get(path, "name")
+            if cached is not None:
+                answers[path] = cached
+    pending = [path for path in image_paths if path not in answers]
+    if pending:
+        answers.update(zip(pending, request_filenames(pending, model, ollama_url)))
+        if results is not None:
+            for path in pending:
+                if usable_name(answers[path]):
+                    results.put(path, "name", answers[path])
+    
+    suggestions = clean_suggestions([answers[path] for path in image_paths], case_style)
+    for path, suggested in zip(image_paths, suggestions):
+        log(f"  {path.name} → {suggested}{path.suffix.lower()}")
+    return suggestions
+
+
+def request_filenames(image_paths: list[Path], model: str, ollama_url: str) -> list[str]:
+    """Ask for names for several images at once; returns the raw suggestions."""
+    prompt = (
+        f"You are given {len(image_paths)} images. "
+        "For each image, in order, suggest a concise, descriptive filename "
+        "(5-8 words max, use underscores instead of spaces). "
+        "Focus on the main subject or content. "
+        f'Respond with JSON of the form {{"filenames": [...]}} containing exactly {len(image_paths)} filenames.'
+    )
+    response = call_ollama_vision(model, prompt, image_paths, ollama_url, json_format=True)
+    
+    try:
+        filenames = json_loads(response)["filenames"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"unparseable batch response: {e}") from e
+    if not isinstance(filenames, list) or len(filenames) != len(image_paths):
+        raise ValueError(f"expected {len(image_paths)} filenames, got {filenames!r}")
+    return [str(name) for name in filenames]
+
+
+def move_files(
+    moves: list[tuple[Path, Path]],
+    make_parents: bool = False,
+    workers: int = 16,
+) -> list[Exception | None]:
+    """
+    Rename each (old, new) pair, optionally creating the target folders first.
+    Renames are independent syscalls, so they run on a thread pool.
+    Returns the error for each pair, or None where the move succeeded.
+    """
+    # Each target folder is created once up front, not once per file moved into it
+    folder_errors: dict[Path, Exception] = {}
+    if make_parents:
+        for folder in {new_path.parent for _, new_path in moves}:
+            try:
+                folder.mkdir(parents=True, exist_ok=True)
+            except Exception as e:
+                folder_errors[folder] = e
+    
+    def move(paths: tuple[Path, Path]) -> Exception | None:
+        old_path, new_path = paths
+        if new_path.parent in folder_errors:
+            return folder_errors[new_path.parent]
+        try:
+            old_path.rename(new_path)
+        except Exception as e:
+            return e
+        return None
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(move, moves))
+
+
+SUPPORTED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp",  # Images
+    ".pdf",  # PDFs
+    ".docx", ".pptx",  # Office documents
+    ".mov", ".mp4", ".avi", ".mkv", ".webm",  # Videos
+    ".txt", ".md", ".ipynb", ".py", ".js", ".json",  # Text/Code
+}
+
+
+def list_supported_files(directory: Path) -> list[Path]:
+    """Files directly in `directory` with a supported extension."""
+    # scandir's entries carry the file type from the directory listing itself,
+    # so (symlinks aside) no stat call is needed per entry
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path) for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS
+            and entry.is_file()
+        ]
 
 
 def rename_files_in_directory(
@@ -599,24 +1520,21 @@ def rename_files_in_directory(
     model: str,
     ollama_url: str,
     dry_run: bool = True,
-    dpi: int = 150,
+    render: RenderOptions = RenderOptions(),
     case_style: str = "snake",
+    concurrency: int = 1,
+    render_workers: int = 1,
+    files_per_request: int = 1,
+    results: ResultCache | None = None,
 ) -> None:
     """
     Rename all supported files in a directory based on their content.
+    Up to `concurrency` files are analyzed in parallel, and PDF pages are
+    rendered in the background by `render_workers` processes.
+    With `files_per_request` > 1, images are named in batches of that size per request.
+    Files with a suggestion in `results` are not sent to the model again.
     """
-    supported_extensions = {
-        ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp",  # Images
-        ".pdf",  # PDFs
-        ".docx", ".pptx",  # Office documents
-        ".mov", ".mp4", ".avi", ".mkv", ".webm",  # Videos
-        ".txt", ".md", ".ipynb", ".py", ".js", ".json",  # Text/Code
-    }
-    
-    files = [
-        f for f in directory.iterdir()
-        if f.is_file() and f.suffix.lower() in supported_extensions
-    ]
+    files = list_supported_files(directory)
     
     if not files:
         print(f"No supported files found in {directory}")
@@ -625,47 +1543,106 @@ def rename_files_in_directory(
     print(f"Found {len(files)} files to process")
     print(f"Model: {model}")
     print(f"Case style: {case_style}")
+    print(f"Concurrency: {concurrency}")
+    if files_per_request > 1:
+        print(f"Images per request: {files_per_request}")
     print(f"Mode: {'DRY RUN' if dry_run else 'RENAMING'}")
     
+    configure_http_session(max(1, concurrency))
+    
+    def analyze(file_path: Path) -> str | None:
+        with buffered_output():
+            try:
+                return generate_filename_for_file(
+                    file_path, model, ollama_url, render, case_style,
+                    rendered_page(pdf_pages, file_path), results,
+                )
+            except Exception as e:
+                log(f"  Error processing {file_path.name}: {e}")
+                return None
+    
+    # One slot per file, filled by position, so batches can complete in any order
+    suggestions: list[str | None] = [None] * len(files)
+    
+    def analyze_batch(batch: list[int]) -> None:
+        with buffered_output(), reused_encodings():
+            if len(batch) > 1:
+                try:
+                    names = generate_filenames_for_images(
+                        [files[i] for i in batch], model, ollama_url, case_style, results
+                    )
+                    for i, name in zip(batch, names):
+                        suggestions[i] = name
+                    return
+                except Exception as e:
+                    log(f"  Batch request failed ({e}), analyzing files individually")
+            for i in batch:
+                suggestions[i] = analyze(files[i])
+    
+    # Images need no preprocessing, so they can share a request; everything else goes alone
+    if files_per_request > 1:
+        images = [i for i, f in enumerate(files) if f.suffix.lower() in IMAGE_EXTENSIONS]
+    else:
+        images = []
+    batch_size = max(1, files_per_request)
+    batches = [images[i:i + batch_size] for i in range(0, len(images), batch_size)]
+    batched = set(images)
+    batches += [[i] for i in range(len(files)) if i not in batched]
+    
+    # Files answered by an earlier run need no conversion or rendering
+    unanswered = [f for f in files if results is None or results.get(f, "name") is None]
+    # One LibreOffice process converts every office document not already answered
+    convert_office_to_pdf(f for f in unanswered if f.suffix.lower() in OFFICE_EXTENSIONS)
+    
+    # Ollama requests are I/O-bound, so threads keep the server's parallel slots busy
+    # while PDF pages render in the background processes.
+    with pdf_page_renders(unanswered, render, render_workers) as pdf_pages:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            list(executor.map(analyze_batch, batches))
+    
     renames = []
+    # Targets already claimed by an earlier file in this run; the renames happen
+    # concurrently, so two files must never be given the same new path
+    taken: set[Path] = set()
     
-    for file_path in files:
-        try:
-            new_name = generate_filename_for_file(file_path, model, ollama_url, dpi, case_style)
-            new_path = file_path.parent / f"{new_name}{file_path.suffix}"
-            
-            # Avoid overwriting existing files
-            counter = 1
-            while new_path.exists() and new_path != file_path:
-                new_path = file_path.parent / f"{new_name}_{counter}{file_path.suffix}"
-                counter += 1
-            
-            if new_path != file_path:
-                renames.append((file_path, new_path))
+    for file_path, new_name in zip(files, suggestions):
+        if new_name is None:
+            continue
+        new_path = file_path.parent / f"{new_name}{file_path.suffix}"
         
-        except Exception as e:
-            print(f"  Error processing {file_path.name}: {e}")
+        # Avoid overwriting existing files
+        counter = 1
+        while (new_path.exists() or new_path in taken) and new_path != file_path:
+            new_path = file_path.parent / f"{new_name}_{counter}{file_path.suffix}"
+            counter += 1
+        
+        if new_path != file_path:
+            renames.append((file_path, new_path))
+            taken.add(new_path)
     
     # Execute renames
-    print("\n" + "=" * 60)
-    print("RENAME SUMMARY")
-    print("=" * 60)
+    errors = [None] * len(renames) if dry_run else move_files(renames)
     
-    for old_path, new_path in renames:
-        print(f"\n{old_path.name}")
-        print(f"  → {new_path.name}")
+    # Written as one block, rather than a print() per line
+    with buffered_output():
+        log("\n" + "=" * 60)
+        log("RENAME SUMMARY")
+        log("=" * 60)
         
-        if not dry_run:
-            try:
-                old_path.rename(new_path)
-                print("  ✓ Renamed")
-            except Exception as e:
-                print(f"  ✗ Error: {e}")
-    
-    if dry_run:
-        print("\n" + "=" * 60)
-        print("This was a DRY RUN. Use --execute to actually rename files.")
-        print("=" * 60)
+        for (old_path, new_path), error in zip(renames, errors):
+            log(f"\n{old_path.name}")
+            log(f"  → {new_path.name}")
+        
+            if not dry_run:
+                if error is None:
+                    log("  ✓ Renamed")
+                else:
+                    log(f"  ✗ Error: {error}")
+        
+        if dry_run:
+            log("\n" + "=" * 60)
+            log("This was a DRY RUN. Use --execute to actually rename files.")
+            log("=" * 60)
 
 
 def organize_files_in_directory(
@@ -673,30 +1650,28 @@ def organize_files_in_directory(
     model: str,
     ollama_url: str,
     dry_run: bool = True,
-    dpi: int = 150,
+    render: RenderOptions = RenderOptions(),
     case_style: str = "snake",
     categories: list[str] | None = None,
     rename_files: bool = False,
+    render_workers: int = 1,
+    concurrency: int = 1,
+    files_per_request: int = 1,
+    results: ResultCache | None = None,
 ) -> None:
     """
     Organize files into categorized folders based on their content.
     Optionally rename files within folders.
+    Up to `concurrency` files are analyzed in parallel, and PDF pages are rendered
+    once in the background and shared by both passes.
+    With `rename_files`, each file's category and name come from a single request;
+    otherwise, with `files_per_request` > 1, text files are categorized in batches of that size.
+    Files with answers in `results` are not sent to the model again.
     """
     if categories is None:
         categories = DEFAULT_CATEGORIES
     
-    supported_extensions = {
-        ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp",  # Images
-        ".pdf",  # PDFs
-        ".docx", ".pptx",  # Office documents
-        ".mov", ".mp4", ".avi", ".mkv", ".webm",  # Videos
-        ".txt", ".md", ".ipynb", ".py", ".js", ".json",  # Text/Code
-    }
-    
-    files = [
-        f for f in directory.iterdir()
-        if f.is_file() and f.suffix.lower() in supported_extensions
-    ]
+    files = list_supported_files(directory)
     
     if not files:
         print(f"No supported files found in {directory}")
@@ -707,81 +1682,148 @@ def organize_files_in_directory(
     print(f"Categories: {', '.join(categories)}")
     print(f"Rename files: {'Yes' if rename_files else 'No'}")
     print(f"Case style: {case_style}")
+    print(f"Concurrency: {concurrency}")
+    if files_per_request > 1 and not rename_files:
+        print(f"Text files per request: {files_per_request}")
     print(f"Mode: {'DRY RUN' if dry_run else 'ORGANIZING'}")
     
-    # Categorize all files
-    file_categories: dict[Path, str] = {}
+    configure_http_session(max(1, concurrency))
     
-    for file_path in files:
-        try:
-            category = categorize_file(file_path, model, ollama_url, categories, dpi)
-            file_categories[file_path] = category
-        except Exception as e:
-            print(f"  Error categorizing {file_path.name}: {e}")
-            file_categories[file_path] = "other"
+    def categorize(file_path: Path) -> str:
+        with buffered_output():
+            try:
+                return categorize_file(
+                    file_path, model, ollama_url, categories, render,
+                    rendered_page(pdf_pages, file_path), results,
+                )
+            except Exception as e:
+                log(f"  Error categorizing {file_path.name}: {e}")
+                return "other"
+    
+    def categorize_batch(batch: list[Path]) -> list[str]:
+        with buffered_output():
+            if len(batch) > 1:
+                try:
+                    return categorize_files_batch(batch, model, ollama_url, categories, results)
+                except Exception as e:
+                    log(f"  Batch request failed ({e}), categorizing files individually")
+            return [categorize(file_path) for file_path in batch]
+    
+    # Text snippets are short and need no rendering, so they can share a request
+    if files_per_request > 1:
+        texts = [f for f in files if f.suffix.lower() in TEXT_EXTENSIONS]
+    else:
+        texts = []
+    batch_size = max(1, files_per_request)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    batched = set(texts)
+    batches += [[f] for f in files if f not in batched]
+    
+    def name(file_path: Path) -> str:
+        with buffered_output():
+            try:
+                new_name = generate_filename_for_file(
+                    file_path, model, ollama_url, render, case_style,
+                    rendered_page(pdf_pages, file_path), results,
+                )
+                return f"{new_name}{file_path.suffix}"
+            except Exception as e:
+                log(f"  Error generating name for {file_path.name}: {e}, using original name")
+                return file_path.name
+    
+    def categorize_and_rename(file_path: Path) -> tuple[str, str]:
+        with buffered_output():
+            try:
+                category, new_name = categorize_and_name(
+                    file_path, model, ollama_url, categories, render, case_style,
+                    rendered_page(pdf_pages, file_path), results,
+                )
+                return category, f"{new_name}{file_path.suffix}"
+            except Exception as e:
+                log(f"  Combined request failed ({e}), asking separately")
+            return categorize(file_path), name(file_path)
+    
+    # Files answered by an earlier run need no conversion or rendering
+    kinds = [category_kind(categories)] + (["name"] if rename_files else [])
+    unanswered = [
+        f for f in files
+        if results is None or any(results.get(f, kind) is None for kind in kinds)
+    ]
+    # One LibreOffice process converts every office document not already answered
+    convert_office_to_pdf(f for f in unanswered if f.suffix.lower() in OFFICE_EXTENSIONS)
+    
+    with pdf_page_renders(unanswered, render, render_workers) as pdf_pages:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            if rename_files:
+                # Category and new filename come from one request per file
+                analyzed = list(executor.map(categorize_and_rename, files))
+                file_categories = {f: category for f, (category, _) in zip(files, analyzed)}
+                new_names = [new_name for _, new_name in analyzed]
+            else:
+                # Categorize all files
+                file_categories = {
+                    file_path: category
+                    for batch, batch_categories in zip(batches, executor.map(categorize_batch, batches))
+                    for file_path, category in zip(batch, batch_categories)
+                }
+                new_names = [file_path.name for file_path in files]
     
     # Organize files by category
     moves: list[tuple[Path, Path]] = []
+    # Targets already claimed by an earlier file in this run (moves run concurrently)
+    taken: set[Path] = set()
     
-    for file_path, category in file_categories.items():
+    for file_path, new_name in zip(files, new_names):
         # Create category folder path
-        category_folder = directory / category
-        
-        # Determine new filename
-        if rename_files:
-            try:
-                new_name = generate_filename_for_file(file_path, model, ollama_url, dpi, case_style)
-                new_path = category_folder / f"{new_name}{file_path.suffix}"
-            except Exception as e:
-                print(f"  Error generating name for {file_path.name}: {e}, using original name")
-                new_path = category_folder / file_path.name
-        else:
-            new_path = category_folder / file_path.name
+        category_folder = directory / file_categories[file_path]
+        new_path = category_folder / new_name
         
         # Avoid overwriting existing files
         counter = 1
         original_new_path = new_path
-        while new_path.exists() and new_path != file_path:
+        while (new_path.exists() or new_path in taken) and new_path != file_path:
             stem = original_new_path.stem
             new_path = category_folder / f"{stem}_{counter}{file_path.suffix}"
             counter += 1
         
         if new_path != file_path:
             moves.append((file_path, new_path))
+            taken.add(new_path)
     
-    # Execute organization
-    print("\n" + "=" * 60)
-    print("ORGANIZATION SUMMARY")
-    print("=" * 60)
-    
-    # Group by category for better display
-    by_category: dict[str, list[tuple[Path, Path]]] = {}
-    for old_path, new_path in moves:
-        category = file_categories[old_path]
-        if category not in by_category:
-            by_category[category] = []
-        by_category[category].append((old_path, new_path))
-    
-    for category in sorted(by_category.keys()):
-        print(f"\n[{category.upper()}]")
-        for old_path, new_path in by_category[category]:
-            print(f"  {old_path.name}")
-            print(f"    → {new_path.relative_to(directory)}")
-            
-            if not dry_run:
-                try:
-                    # Create category folder if it doesn't exist
-                    new_path.parent.mkdir(parents=True, exist_ok=True)
-                    # Move the file
-                    old_path.rename(new_path)
-                    print("    ✓ Organized")
-                except Exception as e:
-                    print(f"    ✗ Error: {e}")
+    # Execute organization, creating category folders as needed
+    errors = {} if dry_run else dict(zip(moves, move_files(moves, make_parents=True)))
     
-    if dry_run:
-        print("\n" + "=" * 60)
-        print("This was a DRY RUN. Use --execute to actually organize files.")
-        print("=" * 60)
+    # Written as one block, rather than a print() per line
+    with buffered_output():
+        log("\n" + "=" * 60)
+        log("ORGANIZATION SUMMARY")
+        log("=" * 60)
+        
+        # Group by category for better display
+        by_category: dict[str, list[tuple[Path, Path]]] = {}
+        for old_path, new_path in moves:
+            category = file_categories[old_path]
+            if category not in by_category:
+                by_category[category] = []
+            by_category[category].append((old_path, new_path))
+        
+        for category in sorted(by_category.keys()):
+            log(f"\n[{category.upper()}]")
+            for old_path, new_path in by_category[category]:
+                log(f"  {old_path.name}")
+                log(f"    → {new_path.relative_to(directory)}")
+        
+                if not dry_run:
+                    error = errors[old_path, new_path]
+                    if error is None:
+                        log("    ✓ Organized")
+                    else:
+                        log(f"    ✗ Error: {error}")
+        
+        if dry_run:
+            log("\n" + "=" * 60)
+            log("This was a DRY RUN. Use --execute to actually organize files.")
+            log("=" * 60)
 
 
 def main() -> None:
@@ -814,15 +1856,90 @@ def main() -> None:
         default=150,
         help="DPI for PDF rendering (default: 150)",
     )
+    parser.add_argument(
+        "--max-image-px",
+        type=int,
+        default=1536,
+        help="Cap the long side of rendered pages at this many pixels, 0 for no cap "
+             "(default: 1536, about what vision models use internally)",
+    )
+    parser.add_argument(
+        "--colorspace",
+        choices=["rgb", "gray"],
+        default="rgb",
+        help="Colorspace for rendered pages (default: rgb). "
+             "gray sends a third of the data and suits text documents",
+    )
+    parser.add_argument(
+        "--image-format",
+        choices=["jpeg", "png"],
+        default="jpeg",
+        help="Encoding for rendered pages sent to the model (default: jpeg). "
+             "png is lossless and can help with fine line art",
+    )
+    parser.add_argument(
+        "--jpeg-quality",
+        type=int,
+        default=85,
+        help="JPEG quality for rendered pages, 1-100 (default: 85)",
+    )
+    parser.add_argument(
+        "--skip-annotations",
+        action="store_true",
+        help="Do not draw PDF annotations (highlights, stamps, form values) when rendering",
+    )
+    parser.add_argument(
+        "--pdf-text-min-words",
+        type=int,
+        default=30,
+        help="Send a PDF's own text instead of a rendered page when its first page "
+             "has at least this many words (default: 30)",
+    )
+    parser.add_argument(
+        "--force-vision",
+        action="store_true",
+        help="Always render PDF pages for the vision model, even when they contain text",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=default_cache_dir(),
+        help="Directory for cached rendered pages and model answers (default: ~/.cache/smartname)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-render and re-analyze files instead of reusing cached results",
+    )
     parser.add_argument(
         "--case",
         dest="case_style",
-        choices=["snake", "kebab", "camel", "pascal", "lower", "title"],
+        # Interned like the style names in the code, so style lookups compare by identity
+        type=sys.intern,
+        choices=CASE_STYLES,
         default="snake",
         help="Casing style for filenames (default: snake). Options: "
              "snake (snake_case), kebab (kebab-case), camel (camelCase), "
              "pascal (PascalCase), lower (lowercase with spaces), "
-             "title (Title Case With Spaces)",
+             "title (Title Case With Spaces), none (keep the suggested casing)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=default_concurrency(),
+        help="Number of files to analyze in parallel (default: $OLLAMA_NUM_PARALLEL or 4)",
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=default_render_workers(),
+        help="Number of processes used to render PDF pages (default: CPU count, max 6)",
+    )
+    parser.add_argument(
+        "--files-per-request",
+        type=int,
+        default=1,
+        help="Send up to this many images (naming) or text files (categorizing) per Ollama request (default: 1)",
     )
     parser.add_argument(
         "--organize",
@@ -851,6 +1968,24 @@ def main() -> None:
         print("Warning: --rename-in-folders requires --organize, ignoring flag")
         args.rename_in_folders = False
     
+    render = RenderOptions(
+        dpi=args.dpi,
+        max_image_px=args.max_image_px or None,
+        colorspace=args.colorspace,
+        image_format=args.image_format,
+        jpeg_quality=args.jpeg_quality,
+        annotations=not args.skip_annotations,
+        pdf_text_min_words=None if args.force_vision else args.pdf_text_min_words,
+        cache_dir=None if args.no_cache else args.cache_dir,
+    )
+    
+    results = None
+    if not args.no_cache:
+        try:
+            results = ResultCache(args.cache_dir / "cache.sqlite", args.model)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not open result cache, continuing without it: {e}")
+    
     # Choose mode: organize or rename
     if args.organize:
         organize_files_in_directory(
@@ -858,10 +1993,14 @@ def main() -> None:
             model=args.model,
             ollama_url=args.ollama_url,
             dry_run=not args.execute,
-            dpi=args.dpi,
+            render=render,
             case_style=args.case_style,
             categories=args.categories,
             rename_files=args.rename_in_folders,
+            render_workers=args.render_workers,
+            concurrency=args.concurrency,
+            files_per_request=args.files_per_request,
+            results=results,
         )
     else:
         rename_files_in_directory(
@@ -869,8 +2008,12 @@ def main() -> None:
             model=args.model,
             ollama_url=args.ollama_url,
             dry_run=not args.execute,
-            dpi=args.dpi,
+            render=render,
             case_style=args.case_style,
+            concurrency=args.concurrency,
+            render_workers=args.render_workers,
+            files_per_request=args.files_per_request,
+            results=results,
         )
 
 